@@ -1,6 +1,10 @@
 from flask import Flask, render_template
+from collections import OrderedDict
 import csv
+import itertools
 import os
+import numpy as np
+import pandas as pd
 
 app = Flask(__name__)
 
@@ -16,17 +20,89 @@ COLUMNS = [
     "transaction_date",  # Date of purchase (standardized to YYYY-MM-DD)
 ]
 
-def read_csv(filename):
-    """Read CSV file and return list of dictionaries"""
+NUMERIC_COLUMNS = ["quantity", "price_per_unit", "total_price"]
+
+# Shared by every row without changes instead of a fresh empty set per row
+NO_DIFFS = frozenset()
+
+# Limit the comparison table to the first rows for performance
+DISPLAY_LIMIT = 108
+
+# Parsed CSVs keyed on (filename, mtime, variant) so unchanged files are not re-read per request
+_CACHE = OrderedDict()
+_CACHE_SIZE = 8
+
+def _cached(filename, variant, load):
+    """Return load(filename), reusing the last result until the file's mtime changes"""
+    key = (filename, os.stat(filename).st_mtime_ns, variant)
+    if key in _CACHE:
+        _CACHE.move_to_end(key)
+        return _CACHE[key]
+
+    result = load(filename)
+    _CACHE[key] = result
+    if len(_CACHE) > _CACHE_SIZE:
+        _CACHE.popitem(last=False)
+    return result
+
+def read_csv(filename, limit=None):
+    """
+    Read CSV file and return its rows as lists of fields in COLUMNS order.
+    Columns missing from the file read as ''.
+    Only the first `limit` data rows are parsed when a limit is given.
+    Results are cached until the file's mtime changes; callers must not mutate them.
+    """
+    def load(path):
+        with open(path, newline="", encoding="utf-8") as f:
+            # Plain reader skips the per-row dict DictReader would build
+            reader = csv.reader(f)
+            header = next(reader, [])
+            # Skip blank lines the way DictReader does, before applying the limit
+            rows = list(itertools.islice((row for row in reader if row), limit))
+
+        if header == COLUMNS:
+            return rows
+
+        # Reorder other layouts once here instead of looking up columns per cell
+        positions = [header.index(col) if col in header else None for col in COLUMNS]
+        return [
+            [row[i] if i is not None and i < len(row) else '' for i in positions]
+            for row in rows
+        ]
+
     try:
-        with open(filename, newline="", encoding="utf-8") as f:
-            # Use DictReader with actual header
-            reader = csv.DictReader(f)
-            return list(reader)
+        return _cached(filename, ("rows", limit), load)
     except FileNotFoundError:
         print(f"Warning: {filename} not found")
         return []
 
+def count_rows(filename):
+    """
+    Count data rows (excluding the header and blank lines) as read_csv would
+    return them, reusing a cached full parse of the file when there is one
+    """
+    def load(path):
+        rows = _CACHE.get((path, os.stat(path).st_mtime_ns, ("rows", None)))
+        if rows is not None:
+            return len(rows)
+
+        with open(path, newline="", encoding="utf-8") as f:
+            # Count records, not lines: quoted fields may span lines
+            reader = csv.reader(f)
+            next(reader, None)
+            return sum(1 for row in reader if row)
+
+    try:
+        return _cached(filename, "count", load)
+    except FileNotFoundError:
+        return 0
+
+def row_to_dict(row):
+    """Zip a positional row back to a column -> value mapping for templates"""
+    if row is None:
+        return None
+    return dict(zip(COLUMNS, row))
+
 def format_currency(value):
     """
     Example:
@@ -38,50 +114,66 @@ def format_currency(value):
     except (ValueError, TypeError):
         return value
 
+def diff_mask(original, cleaned):
+    """
+    Compare two row blocks column-wise and return a boolean array of changed cells.
+    Numeric columns compare as floats where both sides parse, otherwise as stripped text.
+    """
+    orig_df = pd.DataFrame(original, columns=COLUMNS).fillna('')
+    clean_df = pd.DataFrame(cleaned, columns=COLUMNS).fillna('')
+
+    mask = np.zeros((len(orig_df), len(COLUMNS)), dtype=bool)
+    for j, col in enumerate(COLUMNS):
+        orig_val = orig_df[col].astype(str).str.strip().to_numpy()
+        clean_val = clean_df[col].astype(str).str.strip().to_numpy()
+        mask[:, j] = orig_val != clean_val
+
+        # Handle numeric comparison for quantity, price fields
+        if col in NUMERIC_COLUMNS:
+            orig_num = pd.to_numeric(orig_df[col], errors='coerce').to_numpy(dtype=float)
+            clean_num = pd.to_numeric(clean_df[col], errors='coerce').to_numpy(dtype=float)
+            both = ~np.isnan(orig_num) & ~np.isnan(clean_num)
+            mask[both, j] = orig_num[both] != clean_num[both]
+
+    return mask
+
 @app.route("/")
 def compare_csv():
     """Main comparison page"""
-    original = read_csv("sales_transactions.csv")
-    cleaned = read_csv("cleaned_sales_transactions.csv")
+    original = read_csv("sales_transactions.csv", limit=DISPLAY_LIMIT)
+    cleaned = read_csv("cleaned_sales_transactions.csv", limit=DISPLAY_LIMIT)
+    original_count = count_rows("sales_transactions.csv")
+    cleaned_count = count_rows("cleaned_sales_transactions.csv")
     
     # Get some stats for the header
     stats = {
-        'original_count': len(original),
-        'cleaned_count': len(cleaned),
-        'rows_removed': len(original) - len(cleaned),
-        'cleaning_percentage': round((1 - len(cleaned)/len(original)) * 100, 1) if original else 0
+        'original_count': original_count,
+        'cleaned_count': cleaned_count,
+        'rows_removed': original_count - cleaned_count,
+        'cleaning_percentage': round((1 - cleaned_count/original_count) * 100, 1) if original_count else 0
     }
 
-    max_len = max(len(original), len(cleaned))
-    rows_to_display = []
+    display_len = min(max(len(original), len(cleaned)), DISPLAY_LIMIT)
+    paired_len = min(len(original), len(cleaned), display_len)
+
+    # Only rows present on both sides can differ; a row whose raw fields
+    # are identical is skipped before any per-cell work
+    changed = [i for i in range(paired_len) if original[i] != cleaned[i]]
 
-    for i in range(min(max_len, 108)):  # Limit to first 108 rows for performance
+    mask = diff_mask([original[i] for i in changed], [cleaned[i] for i in changed])
+    diffs_by_row = {}
+    for k, j in zip(*np.nonzero(mask)):
+        diffs_by_row.setdefault(changed[k], set()).add(COLUMNS[j])
+
+    rows_to_display = []
+    for i in range(display_len):
         orig_row = original[i] if i < len(original) else None
         clean_row = cleaned[i] if i < len(cleaned) else None
 
-        diffs = set()
-        if orig_row and clean_row:
-            # Compare normalized values
-            for col in COLUMNS:
-                orig_val = str(orig_row.get(col, '')).strip()
-                clean_val = str(clean_row.get(col, '')).strip()
-
-                # Handle numeric comparison for quantity, price fields
-                if col in ['quantity', 'price_per_unit', 'total_price']:
-                    try:
-                        if float(orig_val) != float(clean_val):
-                            diffs.add(col)
-                    except (ValueError, TypeError):
-                        if orig_val != clean_val:
-                            diffs.add(col)
-                else:
-                    if orig_val != clean_val:
-                        diffs.add(col)
-
         rows_to_display.append({
-            "original": orig_row,
-            "cleaned": clean_row,
-            "diffs": diffs,
+            "original": row_to_dict(orig_row),
+            "cleaned": row_to_dict(clean_row),
+            "diffs": diffs_by_row.get(i, NO_DIFFS),
             "is_dropped": orig_row is not None and clean_row is None,
             "is_new": clean_row is not None and orig_row is None,
             "row_number": i + 1
@@ -103,24 +195,24 @@ def show_stats():
     if not cleaned:
         return "No data available"
     
+    df = pd.DataFrame(cleaned, columns=COLUMNS)
+    quantity = pd.to_numeric(df['quantity'])
+    total_price = pd.to_numeric(df['total_price'])
+
     # Basic statistics
-    total_revenue = sum(float(row.get('total_price', 0)) for row in cleaned)
-    avg_order_value = total_revenue / len(cleaned) if cleaned else 0
+    total_revenue = float(total_price.sum())
+    avg_order_value = total_revenue / len(df) if len(df) else 0
     
     # Product counts by quantity
-    product_counts = {}
-    for row in cleaned:
-        product = row.get('product_name', 'Unknown')
-        qty = int(row.get('quantity', 0))
-        product_counts[product] = product_counts.get(product, 0) + qty
+    product_counts = quantity.groupby(df['product_name'], sort=False).sum()
 
     return render_template(
         "stats.html",
         total_records=len(cleaned),
         total_revenue=total_revenue,
         avg_order_value=avg_order_value,
-        total_quantity=sum(product_counts.values()),
-        product_counts=sorted(product_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        total_quantity=int(product_counts.sum()),
+        product_counts=list(product_counts.nlargest(10).items())
     )
 
 if __name__ == "__main__":
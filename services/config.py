@@ -1,4 +1,5 @@
 import os
+import re
 
 # Database connection details - use environment variables with fallbacks
 DB_USERNAME = os.getenv('DB_USERNAME', 'postgres')
@@ -14,10 +15,35 @@ DATABASE_URL = f'postgresql://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{D
 RAW_DATA_PATH = 'sales_transactions.csv'
 CLEANED_DATA_PATH = 'cleaned_sales_transactions.csv'
 
+# Free-text identifier and name columns, kept as Arrow-backed strings during cleaning
+TEXT_COLUMNS = ['transaction_id', 'customer_id', 'product_id', 'product_name']
+
+# Explicit raw CSV schema so the parser does no per-column type inference
+RAW_DATA_DTYPES = {
+    'transaction_id': str,
+    'customer_id': str,
+    'product_id': str,
+    'product_name': str,
+    'quantity': 'float64',
+    'price_per_unit': 'float64',
+    'total_price': 'float64',
+    'transaction_date': str
+}
+
+# Accepted transaction date formats, in priority order
+DATE_FORMATS = [
+    '%Y-%m-%d',    # 2025-03-09
+    '%Y/%m/%d',    # 2025/03/09
+    '%d/%m/%Y',    # 09/03/2025
+    '%m/%d/%Y',    # 03/09/2025
+    '%B %d, %Y',   # March 09, 2025
+    '%d-%m-%y',    # 09-03-25
+    '%m/%d/%y',    # 03/09/25 (for dates like 07/02/2025)
+]
+
 # Product normalization mapping
 PRODUCT_MAPPING = {
-    r'usb[-\s]?c': 'USB-C Cable',
-    r'usbc': 'USB-C Cable',
+    r'usb[-\s]?c': 'USB-C Cable',  # also covers 'usbc'
     r'webcam': 'Webcam',
     r'mouse': 'Mouse',
     r'keyboard': 'Keyboard',
@@ -28,4 +54,12 @@ PRODUCT_MAPPING = {
     r'headphones': 'Headphones',
     r'charger': 'Charger',
     r'smartphone': 'Smartphone'
-}
\ No newline at end of file
+}
+
+# All product patterns compiled once into a single alternation. Each branch is
+# anchored with a lazy prefix so earlier patterns win, as in PRODUCT_MAPPING order.
+PRODUCT_REGEX = re.compile(
+    '^(?:' + '|'.join(f'.*?(?P<g{i}>{pattern})' for i, pattern in enumerate(PRODUCT_MAPPING)) + ')',
+    re.IGNORECASE | re.DOTALL
+)
+PRODUCT_REPLACEMENTS = list(PRODUCT_MAPPING.values())
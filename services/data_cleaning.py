@@ -1,135 +1,355 @@
+import hashlib
+from collections import OrderedDict
 import pandas as pd
+from pandas.util.version import Version
 import numpy as np
-import re
-from datetime import datetime
-from .config import PRODUCT_MAPPING
-
-def clean_data(df):
+import pyarrow as pa
+import pyarrow.compute as pc
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from .config import DATE_FORMATS, PRODUCT_REGEX, PRODUCT_REPLACEMENTS, TEXT_COLUMNS
+
+# Threads for cleaning row chunks. Most per-row work (cached name lookups,
+# strptime fallbacks) holds the GIL, so cleaning is serial by default; with more
+# workers, frames longer than PARALLEL_CHUNK_ROWS are cleaned in chunks that size
+PARALLEL_WORKERS = 1
+PARALLEL_CHUNK_ROWS = 100_000
+
+# Cleaned frames keyed on an input fingerprint, for clean_data(use_cache=True)
+_CLEAN_CACHE = OrderedDict()
+_CLEAN_CACHE_SIZE = 4
+
+# Parsed dates outside this year range are treated as invalid
+VALID_YEARS = (1900, 2030)
+
+# Candidate quantity dtypes, narrowest first, with their bounds looked up once.
+# Starts at int32: arithmetic on narrower nullable ints wraps silently
+# (Int8 100 * 2 == -56) for code downstream of the cleaned frame.
+_INT_BOUNDS = [(dtype, np.iinfo(dtype)) for dtype in (np.int32, np.int64)]
+
+# Copy-on-Write lets each cleaning step share untouched column buffers with
+# its input instead of copying them. It is always on from pandas 3.0, where
+# the option is deprecated, and the option does not exist before 1.5.
+_OPT_IN_COPY_ON_WRITE = Version(pd.__version__).major < 3
+if _OPT_IN_COPY_ON_WRITE:
+    try:
+        pd.get_option('mode.copy_on_write')
+    except KeyError:
+        _OPT_IN_COPY_ON_WRITE = False
+
+def clean_data(df, use_cache=False):
     """
     The main cleaning function. Applies all cleaning steps to the input DataFrame.
-    Returns a new, cleaned DataFrame.
+    Returns a new, cleaned DataFrame; the input is never modified.
+    With use_cache=True, cleaning the same data again returns a copy of the
+    earlier result. Fingerprinting the input costs a full hashing pass, so
+    leave it off for data that is cleaned once.
     """
-    cleaned_df = df.copy()
+    # Copy-on-Write only for the duration of the call, not for the whole process
+    if not _OPT_IN_COPY_ON_WRITE:
+        return _clean_data(df, use_cache)
+    with pd.option_context('mode.copy_on_write', True):
+        return _clean_data(df, use_cache)
+
+def _clean_data(df, use_cache):
+    """Runs clean_data with the pandas options it needs already in place."""
     print("\nStarting data cleaning process...")
-    initial_count = len(cleaned_df)
+    key = _fingerprint(df) if use_cache else None
+    if use_cache and key in _CLEAN_CACHE:
+        _CLEAN_CACHE.move_to_end(key)
+        print("Input unchanged since an earlier run; reusing its cleaned result")
+        return _CLEAN_CACHE[key].copy()
+
+    initial_count = len(df)
 
-    cleaned_df = _handle_missing_values(cleaned_df)
-    cleaned_df = _normalize_product_names(cleaned_df)
-    cleaned_df = _standardize_dates(cleaned_df)
+    # Object string columns hold one PyObject pointer per cell; Arrow-backed
+    # strings keep them in contiguous buffers that the .str kernels scan directly
+    text_dtypes = {
+        col: 'string[pyarrow]'
+        for col in TEXT_COLUMNS
+        if col in df.columns and df[col].dtype == object
+    }
+    if text_dtypes:
+        df = df.astype(text_dtypes)
+
+    # The row-local steps can run on parallel row chunks for large frames. The
+    # date format order is fixed from the whole column so every chunk agrees.
+    date_formats = _order_date_formats(df['transaction_date'])
+    if PARALLEL_WORKERS > 1 and len(df) > PARALLEL_CHUNK_ROWS:
+        chunks = [df.iloc[i:i + PARALLEL_CHUNK_ROWS] for i in range(0, len(df), PARALLEL_CHUNK_ROWS)]
+        # Chunks clean quietly; progress is reported once for the whole frame
+        print(f"\n1-3. Handling missing values, product names and dates in {len(chunks)} chunks...")
+        clean_rows = partial(_clean_rows, date_formats=date_formats, verbose=False)
+        with ThreadPoolExecutor(max_workers=PARALLEL_WORKERS) as executor:
+            cleaned_df = pd.concat(executor.map(clean_rows, chunks))
+        print(f"Removed {len(df) - len(cleaned_df)} rows with missing critical data or invalid dates")
+    else:
+        cleaned_df = _clean_rows(df, date_formats)
+
+    # Duplicates can span chunks, so they are removed on the combined frame
     cleaned_df = _remove_duplicates(cleaned_df)
+    # Also leaves the final numeric dtypes: nullable integer quantity (Int32
+    # unless it needs Int64), float64 prices (cent values like 2661.33
+    # are not exact in float32)
     cleaned_df = _handle_outliers(cleaned_df)
 
-    # Ensure final data types are correct
-    cleaned_df['quantity'] = cleaned_df['quantity'].astype(int)
-    cleaned_df['price_per_unit'] = cleaned_df['price_per_unit'].astype(float)
-    cleaned_df['total_price'] = cleaned_df['total_price'].astype(float)
-
     print(f"\n=== CLEANING SUMMARY ===")
     print(f"Rows removed: {initial_count - len(cleaned_df)}")
     print(f"Final dataset shape: {cleaned_df.shape}")
     print("\nMissing values after cleaning:")
     print(cleaned_df.isnull().sum())
 
-    return cleaned_df
+    if not use_cache:
+        return cleaned_df
 
-def _handle_missing_values(df):
-    """Handles missing values in price, quantity, and total_price."""
-    print("\n1. Handling missing values...")
-    initial_count = len(df)
+    # Callers get their own copy so changing it cannot corrupt the cached result
+    _CLEAN_CACHE[key] = cleaned_df
+    if len(_CLEAN_CACHE) > _CLEAN_CACHE_SIZE:
+        _CLEAN_CACHE.popitem(last=False)
+    return cleaned_df.copy()
 
-    # Price per unit missing: price_per_unit = total_price / quantity
-    mask_p = df["price_per_unit"].isna() & df["quantity"].notna() & df["total_price"].notna()
-    df.loc[mask_p, "price_per_unit"] = (
-        df.loc[mask_p, "total_price"] / df.loc[mask_p, "quantity"]
-    )
+def _fingerprint(df):
+    """
+    Identifies a frame by its columns, dtypes and a digest of the per-row hashes
+    (index included). The row hashes are digested in order, because row order
+    decides which duplicate is kept.
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16).digest()
+    return tuple(df.columns), tuple(map(str, df.dtypes)), digest
 
-    # Quantity missing: quantity = total_price / price_per_unit
-    mask_q = df["quantity"].isna() & df["price_per_unit"].notna() & df["total_price"].notna()
-    df.loc[mask_q, "quantity"] = (
-        df.loc[mask_q, "total_price"] / df.loc[mask_q, "price_per_unit"]
-    )
+def _clean_rows(df, date_formats, verbose=True):
+    """
+    Applies the cleaning steps that look at one row at a time.
+    Does not modify the input DataFrame; returns a new one.
+    """
+    # The first step returns a new frame, so later steps can work on it in place
+    df = _handle_missing_values(df, verbose)
+    df = _normalize_product_names(df, verbose)
+    return _standardize_dates(df, date_formats, verbose)
 
-    # Total price missing: total_price = quantity * price_per_unit
-    mask_t = df["total_price"].isna() & df["quantity"].notna() & df["price_per_unit"].notna()
-    df.loc[mask_t, "total_price"] = (
-        df.loc[mask_t, "quantity"] * df.loc[mask_t, "price_per_unit"]
-    )
+def _handle_missing_values(df, verbose=True):
+    """
+    Handles missing values in price, quantity, and total_price.
+    Does not modify the input DataFrame; returns a new one.
+    """
+    if verbose:
+        print("\n1. Handling missing values...")
+    initial_count = len(df)
 
-    # Remove rows where critical data is still missing
-    df = df.dropna(subset=['price_per_unit', 'quantity', 'total_price'])
-    print(f"Removed {initial_count - len(df)} rows with missing critical data")
+    # Work on contiguous float64 buffers so all three repairs share one extraction
+    q = df["quantity"].to_numpy(dtype=float, copy=True)
+    p = df["price_per_unit"].to_numpy(dtype=float, copy=True)
+    t = df["total_price"].to_numpy(dtype=float, copy=True)
+    q_nan, p_nan, t_nan = np.isnan(q), np.isnan(p), np.isnan(t)
+
+    # Most rows are complete; only repair and filter when something is missing
+    if (q_nan | p_nan | t_nan).any():
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Price per unit missing: price_per_unit = total_price / quantity
+            np.divide(t, q, out=p, where=p_nan & ~q_nan & ~t_nan)
+
+            # Quantity missing: quantity = total_price / price_per_unit
+            np.divide(t, p, out=q, where=q_nan & ~p_nan & ~t_nan)
+
+            # Total price missing: total_price = quantity * price_per_unit
+            np.multiply(q, p, out=t, where=t_nan & ~q_nan & ~p_nan)
+
+        # Remove rows where critical data is still missing, reusing the repaired
+        # buffers for the mask instead of rescanning the columns with dropna
+        complete = ~(np.isnan(q) | np.isnan(p) | np.isnan(t))
+        if not complete.all():
+            df = df.loc[complete]
+            q, p, t = q[complete], p[complete], t[complete]
+    df = df.assign(quantity=q, price_per_unit=p, total_price=t)
+    if verbose:
+        print(f"Removed {initial_count - len(df)} rows with missing critical data")
 
     return df
 
-def _normalize_product_names(df):
+def _normalize_product_names(df, verbose=True):
     """Normalizes inconsistent product names."""
-    print("\n2. Normalizing product names...")
+    if verbose:
+        print("\n2. Normalizing product names...")
+
+    # Product names repeat heavily, so normalize each distinct value once and
+    # broadcast the results back through the dictionary or category codes
+    names = df['product_name']
+    if isinstance(names.array, pd.arrays.ArrowStringArray):
+        normalized = _normalize_arrow_names(names)
+    else:
+        products = names.astype('category')
+        normalized = [_canonicalize_product(name) for name in products.cat.categories]
+
+        # Code -1 marks a missing name and picks the trailing NaN
+        normalized = np.array(normalized + [np.nan], dtype=object)[products.cat.codes.to_numpy()]
+    # Other dtypes, e.g. Categorical, could not hold the new names
+    dtype = names.dtype if isinstance(names.dtype, pd.StringDtype) else object
+    df['product_name'] = pd.array(normalized, dtype=dtype)
+    if verbose:
+        print("Product names after normalization:")
+        print(df['product_name'].value_counts())
 
-    # First, clean whitespace and convert to lowercase
-    df['product_name'] = df['product_name'].str.strip().str.lower()
+    return df
 
-    def normalize_product_name(name):
-        for pattern, replacement in PRODUCT_MAPPING.items():
-            if re.search(pattern, name, re.IGNORECASE):
-                return replacement
-        return name.title()  # Capitalize first letter of each word as fallback
+def _normalize_arrow_names(names):
+    """
+    Normalizes Arrow-backed product names: trims and lowercases them with Arrow
+    kernels so variants like ' Mouse' and 'mouse ' share one dictionary entry,
+    then canonicalizes each entry once. Missing names stay null.
+    """
+    trimmed = pc.utf8_lower(pc.utf8_trim_whitespace(pa.array(names, from_pandas=True)))
+    encoded = pc.dictionary_encode(trimmed)
+    if isinstance(encoded, pa.ChunkedArray):
+        encoded = encoded.combine_chunks()
+    canonical = pa.array(
+        [_canonicalize_product(name) for name in encoded.dictionary.to_pylist()],
+        type=pa.string(),
+    )
+    return pc.take(canonical, encoded.indices)
 
-    df['product_name'] = df['product_name'].apply(normalize_product_name)
-    print("Product names after normalization:")
-    print(df['product_name'].value_counts())
+@lru_cache(maxsize=4096)
+def _canonicalize_product(name):
+    """Maps one raw product name to its canonical form, memoized across calls."""
+    name = name.strip().lower()
 
-    return df
+    # The first pattern that matches, in PRODUCT_MAPPING order, names its group.
+    # Casefolding is only for matching; it would rewrite e.g. 'ß' as 'ss'.
+    match = PRODUCT_REGEX.match(name.casefold())
+    if match:
+        return PRODUCT_REPLACEMENTS[int(match.lastgroup[1:])]
 
-def _standardize_dates(df):
-    """Standardizes various date formats into YYYY-MM-DD."""
-    print("\n3. Standardizing dates...")
-
-    def parse_date(date_str):
-        # Handle invalid dates and different formats
-        if pd.isna(date_str) or date_str == 'Invalid Date':
-            return np.nan
-
-        # Convert to string first
-        date_str = str(date_str)
-
-        # Try different date formats
-        formats = [
-            '%Y-%m-%d',    # 2025-03-09
-            '%Y/%m/%d',    # 2025/03/09
-            '%d/%m/%Y',    # 09/03/2025
-            '%m/%d/%Y',    # 03/09/2025
-            '%B %d, %Y',   # March 09, 2025
-            '%d-%m-%y',    # 09-03-25
-            '%m/%d/%y',    # 03/09/25 (for dates like 07/02/2025)
-        ]
-
-        for fmt in formats:
-            try:
-                parsed_date = datetime.strptime(date_str, fmt)
-                # Check if year is reasonable (not in distant past/future)
-                if 1900 <= parsed_date.year <= 2030:
-                    return parsed_date.date()
-            except ValueError:
-                continue
-
-        return np.nan  # Return NaN if all formats fail
-
-    df['transaction_date'] = df['transaction_date'].apply(parse_date)
-
-    # Remove rows with invalid dates
+    return name.title()  # Capitalize first letter of each word as fallback
+
+def _standardize_dates(df, formats=None, verbose=True):
+    """
+    Standardizes various date formats into datetime64 dates (YYYY-MM-DD).
+    formats is the order to try them in; by default it is sniffed from df.
+    """
+    if verbose:
+        print("\n3. Standardizing dates...")
+
+    dates = df['transaction_date'].astype('string')
+    parsed = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+    if formats is None:
+        formats = _order_date_formats(dates)
+
+    # Zero-padded ISO dates need no format matching; the cascade then only
+    # sees the rows this fast path could not parse
+    parsed[:] = _parse_iso_dates(dates)
+
+    # Each format only sees the rows no earlier format could parse
+    for fmt in formats:
+        pending = parsed.isna() & dates.notna()
+        if not pending.any():
+            break
+        attempt = pd.to_datetime(dates[pending], format=fmt, errors='coerce')
+        # Check if year is reasonable (not in distant past/future)
+        attempt = attempt.where(attempt.dt.year.between(*VALID_YEARS))
+        parsed.loc[pending] = attempt
+
+    # Remove rows with invalid dates; valid ones stay datetime64 (midnight) rather
+    # than per-row Python date objects
     initial_count = len(df)
-    df = df.dropna(subset=['transaction_date'])
-    print(f"Removed {initial_count - len(df)} rows with invalid dates")
+    valid = parsed.notna().to_numpy()
+    if not valid.all():
+        df, parsed = df.loc[valid], parsed[valid]
+    df = df.assign(transaction_date=parsed)
+    if verbose:
+        print(f"Removed {initial_count - len(df)} rows with invalid dates")
 
     return df
 
+def _parse_iso_dates(dates):
+    """
+    Parses 'YYYY-MM-DD' and 'YYYY/MM/DD' dates straight from the Arrow string
+    buffer with integer arithmetic. Returns datetime64[ns] values; NaT where a
+    value is not in either form, is not a real date, or is outside VALID_YEARS.
+    Neither form can be read as any other DATE_FORMATS entry, so results do
+    not depend on the cascade order.
+    """
+    parsed = np.full(len(dates), np.datetime64('NaT'), dtype='datetime64[ns]')
+    arr = pa.array(dates, from_pandas=True)
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks()
+    fixed = pc.equal(pc.binary_length(arr), 10).fill_null(False)
+    rows = np.flatnonzero(fixed.to_numpy(zero_copy_only=False))
+    if not rows.size:
+        return parsed
+
+    # Every kept value is ten bytes long, so the values sit back to back in the
+    # data buffer from the first offset on: one row of ten bytes per date
+    candidates = arr.filter(fixed)
+    offset_type = np.int64 if pa.types.is_large_string(candidates.type) else np.int32
+    _, offsets, data = candidates.buffers()
+    start = np.frombuffer(offsets, dtype=offset_type, count=1, offset=candidates.offset * offset_type().itemsize)[0]
+    raw = np.frombuffer(data, dtype=np.uint8, count=len(candidates) * 10, offset=start).reshape(-1, 10)
+
+    # int16 holds every value below, including a four-digit year
+    digits = raw.astype(np.int16) - ord('0')
+    is_digit = (digits >= 0) & (digits <= 9)
+    is_digit[:, [4, 7]] = True
+    sep = raw[:, 4]
+    ok = is_digit.all(axis=1) & (sep == raw[:, 7]) & ((sep == ord('-')) | (sep == ord('/')))
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 5] * 10 + digits[:, 6]
+    day = digits[:, 8] * 10 + digits[:, 9]
+    ok &= (
+        (year >= VALID_YEARS[0]) & (year <= VALID_YEARS[1])
+        & (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+    )
+
+    # Days past the end of their month (e.g. Feb 30) roll into the next month,
+    # which the comparison below rejects
+    months = np.where(ok, (year.astype(np.int32) - 1970) * 12 + month - 1, 0).astype('datetime64[M]')
+    days = months.astype('datetime64[D]') + np.where(ok, day - 1, 0)
+    ok &= days.astype('datetime64[M]') == months
+
+    parsed[rows[ok]] = days[ok]
+    return parsed
+
+def _order_date_formats(dates):
+    """
+    Returns DATE_FORMATS in the order to try them. Files usually stick to one
+    format; trying the dominant one first makes the cascade a single pass and
+    lets day/month order follow the file.
+    """
+    dominant = _sniff_date_format(dates, DATE_FORMATS)
+    if dominant is None:
+        return DATE_FORMATS
+    return [dominant] + [fmt for fmt in DATE_FORMATS if fmt != dominant]
+
+def _sniff_date_format(dates, formats, sample_size=50, threshold=0.9):
+    """
+    Returns the format that parses the most of the first non-null dates, or None
+    if no format parses at least `threshold` of them. Ties keep list order.
+    """
+    sample = dates.dropna().head(sample_size).astype('string')
+    if sample.empty:
+        return None
+
+    best_format, best_hits = None, 0
+    for fmt in formats:
+        attempt = pd.to_datetime(sample, format=fmt, errors='coerce')
+        hits = attempt.dt.year.between(*VALID_YEARS).sum()
+        if hits > best_hits:
+            best_format, best_hits = fmt, hits
+        if hits == len(sample):
+            break
+
+    return best_format if best_hits >= threshold * len(sample) else None
+
 def _remove_duplicates(df):
     """Removes duplicate rows from the dataset."""
     print("\n4. Removing duplicates...")
     initial_count = len(df)
 
-    # Keep first occurrence of duplicates based on all columns except transaction_id
-    df = df.drop_duplicates(subset=df.columns.difference(['transaction_id']))
+    # Keep first occurrence of duplicates based on all columns except transaction_id,
+    # hashed into a single uint64 key per row so only one column is deduplicated
+    row_keys = pd.util.hash_pandas_object(df.drop(columns=['transaction_id']), index=False)
+    duplicated = row_keys.duplicated().to_numpy()
+    if duplicated.any():
+        df = df.loc[~duplicated]
     print(f"Removed {initial_count - len(df)} duplicate rows")
 
     return df
@@ -139,58 +359,73 @@ def _handle_outliers(df):
     print("\n5. Handling outliers and mismatches...")
     initial_count = len(df)
 
-    # Find mismatches with tolerance (absolute difference < 0.01)
-    mismatches = ~np.isclose(
-        df["total_price"],
-        df["quantity"] * df["price_per_unit"],
-        rtol=0,
-        atol=0.01
-    )
+    q = df["quantity"].to_numpy(dtype=float, copy=True)
+    p = df["price_per_unit"].to_numpy(dtype=float, copy=True)
+    t = df["total_price"].to_numpy(dtype=float, copy=True)
 
-    # Extract mismatch rows
-    mismatch_rows = df[mismatches]
-    print(f"Found {len(mismatch_rows)} mismatches:")
+    # Find mismatches with tolerance (absolute difference < 0.01)
+    residual = np.empty_like(t)
+    mismatches = ~(_price_residual(q, p, t, out=residual) <= 0.01)
+    print(f"Found {mismatches.sum()} mismatches:")
 
     # Handle conflicts
-    conflict_mask = mismatches & (df["quantity"] > 100) & (df["price_per_unit"] > 1000)
+    conflict_mask = mismatches & (q > 100) & (p > 1000)
     if conflict_mask.any():
         print(f"Resolving {conflict_mask.sum()} conflicting rows (both q>100 and p>1000) by adjusting quantity.")
-        df.loc[conflict_mask, "quantity"] = (
-            df.loc[conflict_mask, "total_price"] / df.loc[conflict_mask, "price_per_unit"]
-        )
-
-    # Fix quantity if it's too large (>100)
-    mask_q = mismatches & (df["quantity"] > 100) & ~conflict_mask
-    df.loc[mask_q, "quantity"] = (
-        df.loc[mask_q, "total_price"] / df.loc[mask_q, "price_per_unit"]
-    )
+
+    # Fix quantity if it's too large (>100), which also resolves the conflicts
+    mask_q = mismatches & (q > 100)
 
     # Fix price_per_unit if it's too large (>1000)
-    mask_p = mismatches & (df["price_per_unit"] > 1000) & ~conflict_mask
-    df.loc[mask_p, "price_per_unit"] = (
-        df.loc[mask_p, "total_price"] / df.loc[mask_p, "quantity"]
-    )
+    mask_p = mismatches & (p > 1000) & ~mask_q
 
     # Otherwise fix total_price
-    mask_t = mismatches & ~(mask_q | mask_p | conflict_mask)
-    df.loc[mask_t, "total_price"] = (
-        df.loc[mask_t, "quantity"] * df.loc[mask_t, "price_per_unit"]
-    )
+    mask_t = mismatches & ~(mask_q | mask_p)
+
+    # The masks are disjoint, so each row is repaired at most once
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(t, p, out=q, where=mask_q)
+        np.divide(t, q, out=p, where=mask_p)
+        np.multiply(q, p, out=t, where=mask_t)
 
     # Round values consistently
-    df["quantity"] = df["quantity"].round(0).astype("Int64")
-    df["price_per_unit"] = df["price_per_unit"].round(2)
-    df["total_price"] = df["total_price"].round(2)
-
-    # Recheck mismatches with tolerance
-    final_check = ~np.isclose(
-        df["total_price"],
-        df["quantity"] * df["price_per_unit"],
-        rtol=0,
-        atol=0.01
-    )
+    np.round(q, 0, out=q)
+    np.round(p, 2, out=p)
+    np.round(t, 2, out=t)
+    df["quantity"] = _to_nullable_int(q)
+    df["price_per_unit"] = p
+    df["total_price"] = t
+
+    # Recheck mismatches with tolerance, reusing the residual buffer
+    final_check = ~(_price_residual(q, p, t, out=residual) <= 0.01)
 
     print(f"Remaining mismatches after adjustment: {final_check.sum()}")
     print(f"Removed {initial_count - len(df)} outlier rows")
 
-    return df
\ No newline at end of file
+    return df
+
+def _price_residual(q, p, t, out):
+    """Writes |total_price - quantity * price_per_unit| into out without temporaries."""
+    np.multiply(q, p, out=out)
+    np.subtract(t, out, out=out)
+    return np.abs(out, out=out)
+
+def _to_nullable_int(values):
+    """
+    Casts a float buffer of whole numbers straight to the narrowest nullable
+    integer array in _INT_BOUNDS that holds it, instead of going through Int64
+    and downcasting.
+    """
+    missing = np.isnan(values)
+    present = values[~missing] if missing.any() else values
+    if present.size and not np.isfinite(present).all():
+        return pd.array(values, dtype="Int64")  # Raises on the infinite values
+
+    low, high = (present.min(), present.max()) if present.size else (0, 0)
+    for dtype, info in _INT_BOUNDS:
+        if info.min <= low and high <= info.max:
+            break
+
+    ints = np.zeros(len(values), dtype=dtype)
+    ints[~missing] = present
+    return pd.arrays.IntegerArray(ints, missing)
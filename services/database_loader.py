@@ -1,21 +1,97 @@
 # database_loader.py
+import csv
+import io
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine, text
-from .config import DATABASE_URL, CLEANED_DATA_PATH
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+from sqlalchemy import BigInteger, Date, create_engine, text
+from .config import DATABASE_URL, CLEANED_DATA_PATH, RAW_DATA_DTYPES
+
+# Column types the cleaned table had when DataFrame.to_sql created it from
+# date objects and int64 quantities; the relational schema also uses DATE
+CLEANED_SALES_SQL_TYPES = {'quantity': BigInteger, 'transaction_date': Date}
+
+# Shared engine so every call reuses one connection pool
+_ENGINE = None
+
+def _get_engine():
+    """Returns the module-wide SQLAlchemy engine, creating it on first use."""
+    global _ENGINE
+    if _ENGINE is None:
+        _ENGINE = create_engine(DATABASE_URL, pool_size=5, pool_pre_ping=True)
+    return _ENGINE
 
 def load_raw_data():
     """Loads the raw data from CSV into a Pandas DataFrame."""
     print(f"Loading raw data from sales_transactions.csv...")
-    df = pd.read_csv('sales_transactions.csv')
+    # The pyarrow engine parses multi-threaded in C++ against the fixed schema
+    df = pd.read_csv('sales_transactions.csv', engine='pyarrow', dtype=RAW_DATA_DTYPES)
     print(f"Success. Loaded {len(df)} rows.")
     return df
 
 def export_to_csv(df, filepath=CLEANED_DATA_PATH):
     """Exports a DataFrame to a CSV file."""
     print(f"\nExporting cleaned data to {filepath}...")
-    df.to_csv(filepath, index=False)
+    if not _write_csv_with_arrow(df, filepath):
+        # Columns or values Arrow would render differently fall back to pandas
+        df.to_csv(filepath, index=False)
     print("Export successful.")
 
+def _write_csv_with_arrow(df, filepath):
+    """
+    Writes df with Arrow's multi-threaded CSV writer, byte for byte as
+    DataFrame.to_csv(index=False) would. Returns False, leaving the file for
+    the caller to overwrite, when some column or value would come out differently.
+    """
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        # pandas quotes an empty value in a one-column file so the line is not blank
+        if table.num_columns < 2:
+            return False
+        columns = [_csv_column(column) for column in table.columns]
+        if any(column is None for column in columns):
+            return False
+
+        # pandas only quotes values that need it. Arrow quotes every string
+        # unless told not to, and then raises on values that need quotes.
+        header = io.StringIO()
+        csv.writer(header, lineterminator='\n').writerow(table.column_names)
+        with open(filepath, 'wb') as f:
+            f.write(header.getvalue().encode('utf-8'))
+            pacsv.write_csv(
+                pa.Table.from_arrays(columns, names=table.column_names), f,
+                pacsv.WriteOptions(include_header=False, quoting_style='none'),
+            )
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return False
+    return True
+
+def _csv_column(column):
+    """
+    Returns column in a form Arrow writes the way DataFrame.to_csv does, or
+    None if there is none.
+    """
+    column_type = column.type
+    if pa.types.is_string(column_type) or pa.types.is_large_string(column_type) \
+            or pa.types.is_integer(column_type) or pa.types.is_date32(column_type):
+        return column
+
+    if pa.types.is_floating(column_type):
+        # Arrow drops the '.0' of whole numbers and formats exponents its own
+        # way, so render the values with NumPy's repr as pandas does
+        values = column.to_numpy()
+        return pa.array(values.astype(str), mask=np.isnan(values))
+
+    if pa.types.is_timestamp(column_type) and column_type.tz is None:
+        # Timestamps with no time of day are written as YYYY-MM-DD
+        dates = column.cast(pa.date32())
+        if pc.all(pc.equal(dates.cast(column_type), column)).as_py() is not False:
+            return dates
+
+    return None
+
 def load_to_postgresql(df, table_name='cleaned_sales'):
     """
     Loads a DataFrame into a PostgreSQL table using SQLAlchemy.
@@ -23,16 +99,11 @@ def load_to_postgresql(df, table_name='cleaned_sales'):
     """
     try:
         print(f"\nConnecting to database and loading into table '{table_name}'...")
-        engine = create_engine(DATABASE_URL)
-
-        df.to_sql(
-            table_name,
-            engine,
-            if_exists='replace',
-            index=False,
-            method='multi',
-            chunksize=1000
-        )
+        engine = _get_engine()
+
+        # Recreate the table from the DataFrame's schema and bulk load it in one
+        # transaction, so a failed load keeps the previous table
+        copy_dataframes(engine, {table_name: df}, replace=True, sql_types=CLEANED_SALES_SQL_TYPES)
         print(f"Success! Loaded {len(df)} rows into PostgreSQL.")
         return True
 
@@ -40,6 +111,37 @@ def load_to_postgresql(df, table_name='cleaned_sales'):
         print(f"Error loading data to PostgreSQL: {e}")
         return False
 
+def copy_dataframes(engine, frames, replace=False, sql_types=None):
+    """
+    Streams DataFrames into existing tables with PostgreSQL COPY.
+    frames maps table name -> DataFrame and is loaded in order in a single
+    transaction, one COPY round-trip per table instead of batched INSERTs.
+    With replace=True each table is first dropped and recreated from its
+    DataFrame's schema in the same transaction; sql_types maps column name ->
+    SQLAlchemy type for columns that should not get the inferred type.
+    """
+    raw_conn = engine.raw_connection()
+    try:
+        with raw_conn.cursor() as cur:
+            for table_name, df in frames.items():
+                if replace:
+                    cur.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+                    dtype = {col: sql_type for col, sql_type in (sql_types or {}).items() if col in df.columns}
+                    cur.execute(pd.io.sql.get_schema(df, table_name, con=engine, dtype=dtype or None))
+
+                buffer = io.StringIO()
+                df.to_csv(buffer, index=False, header=False)
+                buffer.seek(0)
+
+                columns = ', '.join(f'"{col}"' for col in df.columns)
+                cur.copy_expert(f'COPY "{table_name}" ({columns}) FROM STDIN WITH (FORMAT csv)', buffer)
+        raw_conn.commit()
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        raw_conn.close()
+
 def create_relational_tables(engine):
     """Create the relational database tables"""
     schema_sql = """
@@ -89,17 +191,19 @@ def transform_to_relational(df):
     customers['email'] = customers['customer_id'].str.lower() + '@example.com'
     customers['created_date'] = pd.to_datetime('2023-01-01')
 
-    # Extract unique products
-    products = df[['product_id', 'product_name']].drop_duplicates()
+    # Extract unique products, one row per product_id (the primary key)
+    products = df[['product_id', 'product_name']].drop_duplicates('product_id')
     products['category'] = 'Electronics'
-    products['standard_price'] = df.groupby('product_id')['price_per_unit'].transform('mean')
+    mean_price = df.groupby('product_id', sort=False)['price_per_unit'].mean()
+    products['standard_price'] = products['product_id'].map(mean_price)
 
-    # Create transactions
-    transactions = df[['transaction_id', 'customer_id', 'transaction_date']].drop_duplicates()
-    transactions['total_amount'] = df.groupby('transaction_id')['total_price'].transform('sum')
+    # Create transactions, one row per transaction_id (the primary key)
+    transactions = df[['transaction_id', 'customer_id', 'transaction_date']].drop_duplicates('transaction_id')
+    total_amount = df.groupby('transaction_id', sort=False)['total_price'].sum()
+    transactions['total_amount'] = transactions['transaction_id'].map(total_amount)
 
-    # Create transaction items
-    transaction_items = df[['transaction_id', 'product_id', 'quantity', 'price_per_unit', 'total_price']].copy()
+    # Create transaction items; the column selection is already a new frame
+    transaction_items = df[['transaction_id', 'product_id', 'quantity', 'price_per_unit', 'total_price']]
 
     return customers, products, transactions, transaction_items
 
@@ -109,7 +213,7 @@ def load_to_postgresql_relational(df, table_name_prefix=''):
     """
     try:
         print(f"\nCreating relational database structure...")
-        engine = create_engine(DATABASE_URL)
+        engine = _get_engine()
 
         # Create tables
         create_relational_tables(engine)
@@ -117,18 +221,14 @@ def load_to_postgresql_relational(df, table_name_prefix=''):
         # Transform data
         customers, products, transactions, transaction_items = transform_to_relational(df)
 
-        # Load data
-        print("Loading customers...")
-        customers.to_sql('customers', engine, if_exists='append', index=False)
-
-        print("Loading products...")
-        products.to_sql('products', engine, if_exists='append', index=False)
-
-        print("Loading transactions...")
-        transactions.to_sql('transactions', engine, if_exists='append', index=False)
-
-        print("Loading transaction items...")
-        transaction_items.to_sql('transaction_items', engine, if_exists='append', index=False)
+        # Load data; parents before children so foreign keys resolve
+        print("Loading customers, products, transactions and transaction items...")
+        copy_dataframes(engine, {
+            'customers': customers,
+            'products': products,
+            'transactions': transactions,
+            'transaction_items': transaction_items
+        })
 
         print(f"Success! Loaded data into relational schema.")
         return True
@@ -140,7 +240,7 @@ def load_to_postgresql_relational(df, table_name_prefix=''):
 def execute_sql_query(query, params=None):
     """Execute a SQL query and return results"""
     try:
-        engine = create_engine(DATABASE_URL)
+        engine = _get_engine()
         with engine.connect() as conn:
             if params:
                 result = conn.execute(text(query), params)
@@ -162,17 +262,20 @@ def run_sql_file(file_path):
         with open(file_path, 'r') as f:
             sql_content = f.read()
 
-        # Split into individual queries
-        queries = [q.strip() for q in sql_content.split(';') if q.strip()]
-
-        engine = create_engine(DATABASE_URL)
-        with engine.connect() as conn:
-            for query in queries:
-                if query:  # Skip empty queries
-                    conn.execute(text(query))
-            conn.commit()
-
-        print(f"Successfully executed {len(queries)} queries from {file_path}")
+        # Send the whole file in one round-trip; the server splits the statements
+        engine = _get_engine()
+        raw_conn = engine.raw_connection()
+        try:
+            with raw_conn.cursor() as cur:
+                cur.execute(sql_content)
+            raw_conn.commit()
+        except Exception:
+            raw_conn.rollback()
+            raise
+        finally:
+            raw_conn.close()
+
+        print(f"Successfully executed ~{sql_content.count(';')} queries from {file_path}")
         return True
 
     except Exception as e:
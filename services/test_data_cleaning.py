@@ -1,6 +1,7 @@
 import os
 import sys
 import pandas as pd
+import pyarrow as pa
 import pytest
 from datetime import date, datetime
 
@@ -8,66 +9,80 @@ from datetime import date, datetime
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
-    from services.data_cleaning import clean_data, _normalize_product_names
+    from services import data_cleaning
+    from services.data_cleaning import clean_data, _normalize_product_names, _parse_iso_dates
     from services.database_loader import export_to_csv
 except ImportError as e:
     pytest.skip(f"Could not import from services: {e}", allow_module_level=True)
 
+@pytest.fixture(scope="session")
+def fixture_tables():
+    """
+    Build every fixture's data once per session as Arrow tables.
+    Each fixture converts its table to a fresh DataFrame, so tests may modify it.
+    """
+    return {
+        'sample_data': pa.table({
+            'transaction_id': ['test1', 'test2', 'test3'],
+            'customer_id': ['CUST001', 'CUST002', 'CUST003'],
+            'product_id': ['PROD001', 'PROD002', 'PROD003'],
+            'product_name': ['  laptop  ', 'wireless mouse', 'usb-c cable'],
+            'quantity': [2, 1, 3],
+            'price_per_unit': [100.0, 50.0, 25.0],
+            'total_price': [200.0, 50.0, 75.0],
+            'transaction_date': ['2025-03-09', 'invalid_date', '2025/03/10']
+        }),
+        'data_with_valid_dates': pa.table({
+            'transaction_id': ['test1', 'test2'],
+            'customer_id': ['CUST001', 'CUST002'],
+            'product_id': ['PROD001', 'PROD002'],
+            'product_name': ['laptop', 'mouse'],
+            'quantity': [2, 1],
+            'price_per_unit': [100.0, 50.0],
+            'total_price': [200.0, 50.0],
+            'transaction_date': ['2025-03-09', '2025-03-10']
+        }),
+        'data_with_actual_missing_values': pa.table({
+            'transaction_id': ['test1', 'test2', 'test3'],
+            'customer_id': ['CUST001', 'CUST002', 'CUST003'],
+            'product_id': ['PROD001', 'PROD002', 'PROD003'],
+            'product_name': ['laptop', 'mouse', 'keyboard'],
+            'quantity': [2, None, 1],
+            'price_per_unit': [100.0, 50.0, None],
+            'total_price': [200.0, 100.0, 75.0],
+            'transaction_date': ['2025-03-09', '2025-03-10', '2025-03-11']
+        }),
+        'data_with_duplicates': pa.table({
+            'transaction_id': ['test1', 'test2', 'test3'],
+            'customer_id': ['CUST001', 'CUST001', 'CUST002'],
+            'product_id': ['PROD001', 'PROD001', 'PROD002'],
+            'product_name': ['laptop', 'laptop', 'mouse'],
+            'quantity': [2, 2, 1],
+            'price_per_unit': [100.0, 100.0, 50.0],
+            'total_price': [200.0, 200.0, 50.0],
+            'transaction_date': ['2025-03-09', '2025-03-09', '2025-03-10']
+        }),
+    }
+
 @pytest.fixture
-def sample_data():
+def sample_data(fixture_tables):
     """Create a small test dataset"""
-    return pd.DataFrame({
-        'transaction_id': ['test1', 'test2', 'test3'],
-        'customer_id': ['CUST001', 'CUST002', 'CUST003'],
-        'product_id': ['PROD001', 'PROD002', 'PROD003'],
-        'product_name': ['  laptop  ', 'wireless mouse', 'usb-c cable'],
-        'quantity': [2, 1, 3],
-        'price_per_unit': [100.0, 50.0, 25.0],
-        'total_price': [200.0, 50.0, 75.0],
-        'transaction_date': ['2025-03-09', 'invalid_date', '2025/03/10']
-    })
+    return fixture_tables['sample_data'].to_pandas()
 
 @pytest.fixture
-def data_with_valid_dates():
+def data_with_valid_dates(fixture_tables):
     """Test data with only valid dates"""
-    return pd.DataFrame({
-        'transaction_id': ['test1', 'test2'],
-        'customer_id': ['CUST001', 'CUST002'],
-        'product_id': ['PROD001', 'PROD002'],
-        'product_name': ['laptop', 'mouse'],
-        'quantity': [2, 1],
-        'price_per_unit': [100.0, 50.0],
-        'total_price': [200.0, 50.0],
-        'transaction_date': ['2025-03-09', '2025-03-10']
-    })
+    return fixture_tables['data_with_valid_dates'].to_pandas()
 
 @pytest.fixture
-def data_with_actual_missing_values():
+def data_with_actual_missing_values(fixture_tables):
     """Test data with actual missing values that can be calculated"""
-    return pd.DataFrame({
-        'transaction_id': ['test1', 'test2', 'test3'],
-        'customer_id': ['CUST001', 'CUST002', 'CUST003'],
-        'product_id': ['PROD001', 'PROD002', 'PROD003'],
-        'product_name': ['laptop', 'mouse', 'keyboard'],
-        'quantity': [2, None, 1],
-        'price_per_unit': [100.0, 50.0, None],
-        'total_price': [200.0, 100.0, 75.0],
-        'transaction_date': ['2025-03-09', '2025-03-10', '2025-03-11']
-    })
+    return fixture_tables['data_with_actual_missing_values'].to_pandas()
 
 @pytest.fixture
-def data_with_duplicates():
+def data_with_duplicates(fixture_tables):
     """Test data with duplicate rows"""
-    return pd.DataFrame({
-        'transaction_id': ['test1', 'test2', 'test3'],
-        'customer_id': ['CUST001', 'CUST001', 'CUST002'],
-        'product_id': ['PROD001', 'PROD001', 'PROD002'],
-        'product_name': ['laptop', 'laptop', 'mouse'],
-        'quantity': [2, 2, 1],
-        'price_per_unit': [100.0, 100.0, 50.0],
-        'total_price': [200.0, 200.0, 50.0],
-        'transaction_date': ['2025-03-09', '2025-03-09', '2025-03-10']
-    })
+    return fixture_tables['data_with_duplicates'].to_pandas()
 
 def test_clean_data_returns_dataframe(sample_data):
     """Test that clean_data returns a DataFrame"""
@@ -104,6 +119,45 @@ def test_invalid_dates_removed(sample_data):
     assert any('2025-03-09' in d for d in date_strings)
     assert any('2025-03-10' in d for d in date_strings)
 
+def test_mixed_date_formats_standardized(data_with_valid_dates):
+    """Test that each supported date format is parsed to the same calendar date"""
+    data_with_valid_dates['transaction_date'] = ['09/03/2025', 'March 10, 2025']
+    result = clean_data(data_with_valid_dates)
+
+    assert list(result['transaction_date']) == [pd.Timestamp('2025-03-09'), pd.Timestamp('2025-03-10')]
+
+def test_dominant_date_format_resolves_ambiguous_dates(data_with_valid_dates):
+    """Test that ambiguous day/month dates follow the format most rows use"""
+    data_with_valid_dates['transaction_date'] = ['03/25/2025', '03/04/2025']
+    result = clean_data(data_with_valid_dates)
+
+    assert list(result['transaction_date']) == [pd.Timestamp('2025-03-25'), pd.Timestamp('2025-03-04')]
+
+@pytest.mark.parametrize("date_input,expected_output", [
+    ("2025-03-09", "2025-03-09"),
+    ("2025/03/09", "2025-03-09"),
+    ("2024-02-29", "2024-02-29"),
+    ("2025-02-30", None),
+    ("2025-04-31", None),
+    ("2025-13-01", None),
+    ("1899-12-31", None),
+    ("2031-01-01", None),
+    ("2025-03/09", None),
+])
+def test_iso_date_fast_path(date_input, expected_output):
+    """Test that the ISO fast path only accepts real, in-range, consistently separated dates"""
+    result = _parse_iso_dates(pd.Series([date_input], dtype='string'))
+    expected = pd.Series([expected_output], dtype='datetime64[ns]')
+    pd.testing.assert_series_equal(pd.Series(result), expected)
+
+def test_iso_date_fast_path_sliced_input():
+    """Test that the ISO fast path reads a sliced Arrow array from its offset"""
+    dates = pa.array(['2025-01-01', '2025-02-30', '2024-02-29', None, '2025/03/10']).slice(2)
+    result = _parse_iso_dates(pd.Series(pd.arrays.ArrowStringArray(dates)))
+
+    expected = pd.Series(['2024-02-29', None, '2025-03-10'], dtype='datetime64[ns]')
+    pd.testing.assert_series_equal(pd.Series(result), expected)
+
 def test_missing_values_handled(data_with_actual_missing_values):
     """Test that missing values are properly handled"""
     result = clean_data(data_with_actual_missing_values)
@@ -119,6 +173,23 @@ def test_duplicates_removed(data_with_duplicates):
     # Should remove duplicates based on content (not transaction_id)
     assert len(result) <= 3  # Might remove duplicates
 
+def test_duplicate_content_collapsed(data_with_duplicates):
+    """Test that rows differing only in transaction_id keep the first occurrence"""
+    result = clean_data(data_with_duplicates)
+    assert list(result['transaction_id']) == ['test1', 'test3']
+
+def test_parallel_chunks_match_serial(data_with_duplicates, monkeypatch):
+    """Test that cleaning in parallel row chunks gives the serial result, with duplicates spanning chunks"""
+    serial = clean_data(data_with_duplicates)
+
+    # One row per chunk, so the duplicate rows land in different chunks
+    monkeypatch.setattr(data_cleaning, 'PARALLEL_CHUNK_ROWS', 1)
+    monkeypatch.setattr(data_cleaning, 'PARALLEL_WORKERS', 2)
+    parallel = clean_data(data_with_duplicates)
+
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert list(parallel['transaction_id']) == ['test1', 'test3']
+
 def test_data_types_correct(data_with_valid_dates):
     """Test that data types are correct after cleaning - flexible version"""
     result = clean_data(data_with_valid_dates)
@@ -192,6 +263,21 @@ def test_csv_export(tmp_path):
     assert len(df_read) == 3
     assert 'test_col' in df_read.columns
 
+@pytest.mark.parametrize("product_name", ["Laptop", "Laptop, 15 inch"])
+def test_csv_export_matches_pandas_format(tmp_path, product_name):
+    """Test that exported values are written exactly as DataFrame.to_csv writes them"""
+    test_df = pd.DataFrame({
+        'product_name': [product_name, 'Mouse'],
+        'quantity': pd.array([3, None], dtype='Int32'),
+        'price_per_unit': [439.0, None],
+        'total_price': [1317.0, 2661.33],
+        'transaction_date': pd.to_datetime(['2025-03-09', '2025-03-10']),
+    })
+    test_file = tmp_path / "test_export.csv"
+
+    export_to_csv(test_df, str(test_file))
+    assert test_file.read_text() == test_df.to_csv(index=False)
+
 @pytest.mark.parametrize("product_input,expected_output", [
     ("  laptop  ", "Laptop"),
     ("wireless mouse", "Mouse"),
@@ -199,6 +285,9 @@ def test_csv_export(tmp_path):
     ("USB-C", "USB-C Cable"),
     ("webcam", "Webcam"),
     ("keyboard", "Keyboard"),
+    ("keyboard and mouse", "Mouse"),
+    ("gaming chair", "Gaming Chair"),
+    ("  Straße lamp ", "Straße Lamp"),
 ])
 def test_product_mapping(product_input, expected_output):
     """Test various product name mappings"""
@@ -213,6 +302,13 @@ def test_product_mapping(product_input, expected_output):
     result = _normalize_product_names(test_df)
     assert result['product_name'].iloc[0] == expected_output
 
+def test_categorical_product_names_normalized():
+    """Test that Categorical product names are normalized rather than lost"""
+    test_df = pd.DataFrame({'product_name': pd.Categorical([' Laptop', 'usbc cable', 'mouse'])})
+
+    result = _normalize_product_names(test_df)
+    assert list(result['product_name']) == ['Laptop', 'USB-C Cable', 'Mouse']
+
 def test_services_directory_exists():
     """Test that services directory exists"""
     assert os.path.exists('services'), "'services' directory should exist"
@@ -224,4 +320,15 @@ def test_cleaning_does_not_modify_original(sample_data):
 
     # Check that original data is unchanged
     pd.testing.assert_frame_equal(sample_data, original_copy)
-    assert result is not sample_data, "Should return a new DataFrame, not modify the original"
\ No newline at end of file
+    assert result is not sample_data, "Should return a new DataFrame, not modify the original"
+
+
+def test_repeated_cleaning_returns_independent_copies(sample_data):
+    """Test that cached cleaning of the same data gives equal but independent results"""
+    first = clean_data(sample_data, use_cache=True)
+    first['product_name'] = 'changed'
+    second = clean_data(sample_data.copy(), use_cache=True)
+
+    assert second is not first
+    assert (second['product_name'] != 'changed').all(), "Cached result should not share edits"
+    pd.testing.assert_frame_equal(second, clean_data(sample_data))